@@ -3,18 +3,27 @@
 import os, sys
 import uvicorn
 import aiofiles
+import aiofiles.os
 import configparser
 import asyncio
+import hashlib
+import stat
 import time
-import requests
-from typing import List, Optional
+import httpx
+import orjson
+import redis.asyncio as aioredis
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uuid
+from collections import deque
+from functools import lru_cache, partial
+from pathlib import Path
+from urllib.parse import quote, urlsplit
 
 from sources.llm_provider import Provider
 from sources.interaction import Interaction
@@ -29,12 +38,23 @@ from sources.browser import Browser, create_driver
 from sources.utility import pretty_print
 from sources.logger import Logger
 from sources.schemas import QueryRequest, QueryResponse
+from sources.semantic_cache import SemanticCache
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson, stringifying values it cannot encode."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=1)
 def is_running_in_docker():
     """Detect if code is running inside a Docker container."""
     # Method 1: Check for .dockerenv file
@@ -51,16 +71,55 @@ def is_running_in_docker():
     return False
 
 
-from celery import Celery
+from celery.result import AsyncResult
+from tasks import celery_app, process_query_task
 
-api = FastAPI(title="AgenticSeek API", version="0.1.0")
-celery_app = Celery(
-    "tasks", broker="redis://localhost:6379/0", backend="redis://localhost:6379/0"
+api = FastAPI(
+    title="AgenticSeek API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
+# Session metadata lives in its own DB, apart from the Celery broker and results
+SESSION_CACHE_DB = 1
+SESSION_CACHE_TTL = 24 * 60 * 60
+session_cache = aioredis.from_url(
+    urlsplit(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    ._replace(path=f"/{SESSION_CACHE_DB}")
+    .geturl(),
+    socket_connect_timeout=1,
+)
+http_client = httpx.AsyncClient(
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
 )
-celery_app.conf.update(task_track_started=True)
 logger = Logger("backend.log")
+
+
+def config_file_mtime() -> int | None:
+    """Return the mtime of config.ini, or None if it does not exist."""
+    try:
+        return os.stat("config.ini").st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
 config = configparser.ConfigParser()
 config.read("config.ini")
+config_mtime = config_file_mtime()
+SAVE_SESSION = config.getboolean("MAIN", "save_session")
+
+
+def get_config() -> configparser.ConfigParser:
+    """Return the parsed config.ini, re-reading it only when the file changed."""
+    global config, config_mtime
+    mtime = config_file_mtime()
+    if mtime != config_mtime:
+        # A fresh parser, read() would merge into the old sections and keep deleted keys
+        fresh_config = configparser.ConfigParser()
+        fresh_config.read("config.ini")
+        config, config_mtime = fresh_config, mtime
+    return config
+
 
 api.add_middleware(
     CORSMiddleware,
@@ -114,6 +173,18 @@ def initialize_system():
     )
     logger.info(f"Provider initialized: {provider.provider_name} ({provider.model})")
 
+    # Optional smaller model on the same server, used to adapt cached plans
+    plan_adapter = None
+    plan_cache_model = config.get("MAIN", "plan_cache_model", fallback="")
+    if plan_cache_model:
+        plan_adapter = Provider(
+            provider_name=config["MAIN"]["provider_name"],
+            model=plan_cache_model,
+            server_address=config["MAIN"]["provider_server_address"],
+            is_local=config.getboolean("MAIN", "is_local"),
+        )
+        logger.info(f"Plan adapter initialized: {plan_cache_model}")
+
     browser = Browser(
         create_driver(headless=headless, stealth_mode=stealth_mode, lang=languages[0]),
         anticaptcha_manual_install=stealth_mode,
@@ -152,6 +223,7 @@ def initialize_system():
             provider=provider,
             verbose=False,
             browser=browser,
+            plan_adapter=plan_adapter,
         ),
     ]
     logger.info("Agents initialized")
@@ -168,39 +240,138 @@ def initialize_system():
 
 
 interaction = initialize_system()
-is_generating = False
-query_resp_history = []
+# Opt-in: answers are reused for near-identical queries without running the agents
+semantic_cache = (
+    SemanticCache()
+    if config.getboolean("MAIN", "semantic_cache", fallback=False)
+    else None
+)
+AGENT_TYPES = (
+    "casual_agent",
+    "code_agent",
+    "file_agent",
+    "browser_agent",
+    "planner_agent",
+)
+# Held while a query is processed; further queries get a 429
+query_lock = asyncio.Lock()
+query_resp_history = deque(maxlen=int(os.getenv("HISTORY_MAX", "256")))
+
+# Digests of answers already in query_resp_history, bounded to the most recent ones
+SEEN_ANSWERS_MAX = 1000
+seen_answers = set()
+seen_answers_order = deque()
+
+
+def answer_digest(answer: str) -> bytes:
+    return hashlib.blake2b((answer or "").encode(), digest_size=16).digest()
+
+
+def remember_answer(answer: str) -> None:
+    """Record an answer as seen, evicting the oldest digest past the bound."""
+    digest = answer_digest(answer)
+    if digest in seen_answers:
+        return
+    seen_answers.add(digest)
+    seen_answers_order.append(digest)
+    if len(seen_answers_order) > SEEN_ANSWERS_MAX:
+        seen_answers.discard(seen_answers_order.popleft())
+
+
+# At most one pending save: further requests coalesce into it
+save_queue = asyncio.Queue(maxsize=1)
+save_task = None
+# Only one thread may write the session files at a time
+session_save_lock = asyncio.Lock()
+
+
+async def session_saver():
+    """Flush queued session saves one at a time, off the request path."""
+    while True:
+        await save_queue.get()
+        try:
+            async with session_save_lock:
+                await asyncio.to_thread(interaction.save_session)
+        except Exception as e:
+            logger.error(f"Error saving session: {e}")
+        finally:
+            save_queue.task_done()
+
+
+def request_session_save() -> None:
+    """Queue a session save unless one is already pending."""
+    if save_queue.empty():
+        save_queue.put_nowait(True)
+
+
+async def save_session_now() -> None:
+    """Save the session before returning, after any queued save is written."""
+    await save_queue.join()
+    async with session_save_lock:
+        await asyncio.to_thread(interaction.save_session)
+
+
+@api.on_event("startup")
+async def start_session_saver():
+    global save_task
+    save_task = asyncio.create_task(session_saver())
+
+
+@api.on_event("shutdown")
+async def close_clients():
+    await save_queue.join()
+    save_task.cancel()
+    await http_client.aclose()
+    await session_cache.aclose()
 
 
 @api.get("/screenshot")
-async def get_screenshot():
+async def get_screenshot(request: Request):
     logger.info("Screenshot endpoint called")
     screenshot_path = ".screenshots/updated_screen.png"
-    if os.path.exists(screenshot_path):
-        return FileResponse(screenshot_path)
-    logger.error("No screenshot available")
-    return JSONResponse(status_code=404, content={"error": "No screenshot available"})
+    try:
+        screenshot_stat = await asyncio.to_thread(os.stat, screenshot_path)
+    except FileNotFoundError:
+        logger.error("No screenshot available")
+        return ORJSONResponse(
+            status_code=404, content={"error": "No screenshot available"}
+        )
+    # The screenshot is rewritten in place, so mtime and size identify its content
+    etag = f'"{screenshot_stat.st_mtime_ns:x}-{screenshot_stat.st_size:x}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return FileResponse(
+        screenshot_path, headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
 
 
 @api.get("/health")
 async def health_check():
     logger.info("Health check endpoint called")
-    return {"status": "healthy", "version": "0.1.0"}
+    return ORJSONResponse(
+        content={"status": "healthy", "version": "0.1.0"},
+        headers={"Cache-Control": "public, max-age=5"},
+    )
 
 
 @api.get("/is_active")
 async def is_active():
     logger.info("Is active endpoint called")
-    return {"is_active": interaction.is_active, "is_generating": is_generating}
+    return {"is_active": interaction.is_active, "is_generating": query_lock.locked()}
 
 
 @api.post("/reset")
 async def reset_state():
-    """Reset the is_generating flag to recover from stuck states"""
-    global is_generating
+    """Stop a stuck generation so the query lock gets released"""
     logger.info("Reset endpoint called")
-    is_generating = False
-    return JSONResponse(
+    if query_lock.locked():
+        if interaction.current_agent is not None:
+            interaction.current_agent.request_stop()
+        # The lock is released once the running query returns
+        return ORJSONResponse(
+            status_code=202, content={"status": "stopping", "is_generating": True}
+        )
+    return ORJSONResponse(
         status_code=200, content={"status": "reset", "is_generating": False}
     )
 
@@ -209,11 +380,11 @@ async def reset_state():
 async def stop():
     logger.info("Stop endpoint called")
     if interaction.current_agent is None:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404, content={"error": "No active agent to stop"}
         )
     interaction.current_agent.request_stop()
-    return JSONResponse(status_code=200, content={"status": "stopped"})
+    return ORJSONResponse(status_code=200, content={"status": "stopped"})
 
 
 @api.post("/session/clear")
@@ -223,7 +394,7 @@ async def clear_session():
     try:
         for agent in interaction.agents:
             agent.memory.clear()
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "session_cleared",
@@ -232,25 +403,25 @@ async def clear_session():
         )
     except Exception as e:
         logger.error(f"Error clearing session: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.post("/session/save")
 async def save_session():
-    """Force save current session."""
+    """Queue a save of the current session."""
     logger.info("Session save endpoint called")
     try:
-        interaction.save_session()
-        return JSONResponse(
-            status_code=200,
+        request_session_save()
+        return ORJSONResponse(
+            status_code=202,
             content={
-                "status": "session_saved",
-                "message": "Session saved successfully",
+                "status": "session_save_queued",
+                "message": "Session save queued",
             },
         )
     except Exception as e:
         logger.error(f"Error saving session: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.get("/session/info")
@@ -260,7 +431,7 @@ async def get_session_info():
     try:
         session_info = {
             "agents": [],
-            "is_generating": is_generating,
+            "is_generating": query_lock.locked(),
             "current_agent": (
                 interaction.current_agent.agent_name
                 if interaction.current_agent
@@ -272,13 +443,80 @@ async def get_session_info():
                 {
                     "type": agent.type,
                     "name": agent.agent_name,
-                    "memory_messages": len(agent.memory.get()),
+                    "memory_messages": len(agent.memory),
                 }
             )
-        return JSONResponse(status_code=200, content=session_info)
+        return ORJSONResponse(status_code=200, content=session_info)
     except Exception as e:
         logger.error(f"Error getting session info: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
+
+
+async def read_json_file(filepath: str):
+    """Read and parse a JSON file without blocking the event loop."""
+    async with aiofiles.open(filepath, "r") as f:
+        content = await f.read()
+    return orjson.loads(content)
+
+
+async def read_json_file_if_exists(filepath: str):
+    """Read and parse a JSON file, returning None if it does not exist."""
+    try:
+        return await read_json_file(filepath)
+    except FileNotFoundError:
+        return None
+
+
+def get_session_preview(messages: list) -> str:
+    """Get a short preview of a session from its first user message."""
+    for msg in messages:
+        if msg.get("role") == "user":
+            preview = msg.get("content", "")[:100]
+            if len(msg.get("content", "")) > 100:
+                preview += "..."
+            return preview
+    return "No messages"
+
+
+def scan_session_files(directory: str) -> list:
+    """List session files in a directory as (filename, mtime) pairs."""
+    session_files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not (entry.name.startswith("memory_") and entry.name.endswith(".txt")):
+                continue
+            try:
+                session_files.append((entry.name, entry.stat().st_mtime))
+            except FileNotFoundError as e:
+                # Deleted between the scan and the stat, skip it like an unreadable file
+                logger.warning(f"Error reading session file {entry.name}: {e}")
+    return session_files
+
+
+async def get_cached_session_metadata(keys: list) -> list:
+    """Fetch cached session metadata, treating an unreachable cache as misses."""
+    if not keys:
+        return []
+    try:
+        values = await session_cache.mget(keys)
+    except Exception as e:
+        logger.warning(f"Session cache unavailable: {e}")
+        return [None] * len(keys)
+    return [orjson.loads(value) if value else None for value in values]
+
+
+async def set_cached_session_metadata(items: dict) -> None:
+    """Store session metadata in the cache, ignoring cache failures."""
+    if not items:
+        return
+    try:
+        # Keys of modified sessions are never read again, let them expire
+        async with session_cache.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, orjson.dumps(value), ex=SESSION_CACHE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Session cache unavailable: {e}")
 
 
 @api.get("/sessions")
@@ -286,62 +524,66 @@ async def list_sessions():
     """List all saved chat sessions with metadata."""
     logger.info("List sessions endpoint called")
     try:
-        sessions = []
         conversations_dir = "conversations"
 
         # Use the planner_agent folder as the source of truth for session listing
         planner_dir = os.path.join(conversations_dir, "planner_agent")
         if not os.path.exists(planner_dir):
-            return JSONResponse(status_code=200, content={"sessions": []})
-
-        for filename in os.listdir(planner_dir):
-            if filename.startswith("memory_") and filename.endswith(".txt"):
-                filepath = os.path.join(planner_dir, filename)
-                try:
-                    # Extract session ID from filename (the timestamp part)
-                    session_id = filename.replace("memory_", "").replace(".txt", "")
-
-                    # Get file modification time
-                    mtime = os.path.getmtime(filepath)
-
-                    # Read first few messages for preview
-                    with open(filepath, "r") as f:
-                        content = f.read()
-                        import json
-
-                        messages = json.loads(content)
-
-                        # Get preview from first user message
-                        preview = "No messages"
-                        message_count = len(messages)
-                        for msg in messages:
-                            if msg.get("role") == "user":
-                                preview = msg.get("content", "")[:100]
-                                if len(msg.get("content", "")) > 100:
-                                    preview += "..."
-                                break
-
-                        sessions.append(
-                            {
-                                "session_id": session_id,
-                                "filename": filename,
-                                "created_at": session_id,  # Format: YYYY-MM-DD_HH-MM-SS
-                                "modified_at": mtime,
-                                "message_count": message_count,
-                                "preview": preview,
-                            }
-                        )
-                except Exception as e:
-                    logger.warning(f"Error reading session file {filename}: {e}")
-                    continue
+            return ORJSONResponse(status_code=200, content={"sessions": []})
+
+        session_files = await asyncio.to_thread(scan_session_files, planner_dir)
+
+        # Cache keys include the mtime, so modified sessions miss and get re-parsed
+        keys = [f"session:{filename}:{mtime}" for filename, mtime in session_files]
+        cached = await get_cached_session_metadata(keys)
+
+        async def read_session_metadata(filename: str) -> dict:
+            messages = await read_json_file(os.path.join(planner_dir, filename))
+            return {
+                "message_count": len(messages),
+                "preview": get_session_preview(messages),
+            }
+
+        misses = [i for i, metadata in enumerate(cached) if metadata is None]
+        results = await asyncio.gather(
+            *(read_session_metadata(session_files[i][0]) for i in misses),
+            return_exceptions=True,
+        )
+        new_entries = {}
+        for i, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Error reading session file {session_files[i][0]}: {result}"
+                )
+                continue
+            cached[i] = result
+            new_entries[keys[i]] = result
+        await set_cached_session_metadata(new_entries)
+
+        sessions = []
+        for (filename, mtime), metadata in zip(session_files, cached):
+            if metadata is None:
+                continue
+            # Extract session ID from filename (the timestamp part)
+            session_id = filename.replace("memory_", "").replace(".txt", "")
+            sessions.append(
+                {
+                    "session_id": session_id,
+                    "filename": filename,
+                    "created_at": session_id,  # Format: YYYY-MM-DD_HH-MM-SS
+                    "modified_at": mtime,
+                    "message_count": metadata["message_count"],
+                    "preview": metadata["preview"],
+                }
+            )
 
         # Sort by modification time, newest first
         sessions.sort(key=lambda x: x["modified_at"], reverse=True)
 
-        return JSONResponse(status_code=200, content={"sessions": sessions})
+        return ORJSONResponse(status_code=200, content={"sessions": sessions})
     except Exception as e:
         logger.error(f"Error listing sessions: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.get("/sessions/{session_id}")
@@ -349,40 +591,37 @@ async def get_session(session_id: str):
     """Get details of a specific session."""
     logger.info(f"Get session endpoint called for: {session_id}")
     try:
-        import json
-
         session_data = {"agents": {}}
 
         conversations_dir = "conversations"
-        agent_types = [
-            "casual_agent",
-            "code_agent",
-            "file_agent",
-            "browser_agent",
-            "planner_agent",
-        ]
 
-        for agent_type in agent_types:
-            filepath = os.path.join(
-                conversations_dir, agent_type, f"memory_{session_id}.txt"
+        results = await asyncio.gather(
+            *(
+                read_json_file_if_exists(
+                    os.path.join(
+                        conversations_dir, agent_type, f"memory_{session_id}.txt"
+                    )
+                )
+                for agent_type in AGENT_TYPES
             )
-            if os.path.exists(filepath):
-                with open(filepath, "r") as f:
-                    content = f.read()
-                    messages = json.loads(content)
-                    session_data["agents"][agent_type] = {
-                        "message_count": len(messages),
-                        "messages": messages,
-                    }
+        )
+        for agent_type, messages in zip(AGENT_TYPES, results):
+            if messages is not None:
+                session_data["agents"][agent_type] = {
+                    "message_count": len(messages),
+                    "messages": messages,
+                }
 
         if not session_data["agents"]:
-            return JSONResponse(status_code=404, content={"error": "Session not found"})
+            return ORJSONResponse(
+                status_code=404, content={"error": "Session not found"}
+            )
 
         session_data["session_id"] = session_id
-        return JSONResponse(status_code=200, content=session_data)
+        return ORJSONResponse(status_code=200, content=session_data)
     except Exception as e:
         logger.error(f"Error getting session {session_id}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.post("/sessions/new")
@@ -391,7 +630,7 @@ async def create_new_session():
     logger.info("Create new session endpoint called")
     try:
         # Save current session first
-        interaction.save_session()
+        await save_session_now()
 
         # Clear all agent memories
         for agent in interaction.agents:
@@ -406,7 +645,7 @@ async def create_new_session():
 
         new_session_id = new_session_time.strftime("%Y-%m-%d_%H-%M-%S")
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "new_session_created",
@@ -416,7 +655,7 @@ async def create_new_session():
         )
     except Exception as e:
         logger.error(f"Error creating new session: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.post("/sessions/{session_id}/load")
@@ -424,38 +663,34 @@ async def load_session(session_id: str):
     """Load a specific session into memory."""
     logger.info(f"Load session endpoint called for: {session_id}")
     try:
-        import json
-
         # First save current session
-        interaction.save_session()
+        await save_session_now()
 
         conversations_dir = "conversations"
-        agent_types = [
-            "casual_agent",
-            "code_agent",
-            "file_agent",
-            "browser_agent",
-            "planner_agent",
-        ]
         loaded_count = 0
 
-        for agent in interaction.agents:
-            filepath = os.path.join(
-                conversations_dir, agent.type, f"memory_{session_id}.txt"
+        results = await asyncio.gather(
+            *(
+                read_json_file_if_exists(
+                    os.path.join(
+                        conversations_dir, agent.type, f"memory_{session_id}.txt"
+                    )
+                )
+                for agent in interaction.agents
             )
-            if os.path.exists(filepath):
-                with open(filepath, "r") as f:
-                    content = f.read()
-                    messages = json.loads(content)
-                    if messages and isinstance(messages, list):
-                        agent.memory.memory = messages
-                        loaded_count += 1
-                        logger.info(f"Loaded {len(messages)} messages for {agent.type}")
+        )
+        for agent, messages in zip(interaction.agents, results):
+            if messages and isinstance(messages, list):
+                agent.memory.memory = messages
+                loaded_count += 1
+                logger.info(f"Loaded {len(messages)} messages for {agent.type}")
 
         if loaded_count == 0:
-            return JSONResponse(status_code=404, content={"error": "Session not found"})
+            return ORJSONResponse(
+                status_code=404, content={"error": "Session not found"}
+            )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "session_loaded",
@@ -466,7 +701,7 @@ async def load_session(session_id: str):
         )
     except Exception as e:
         logger.error(f"Error loading session {session_id}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.delete("/sessions/{session_id}")
@@ -475,28 +710,29 @@ async def delete_session(session_id: str):
     logger.info(f"Delete session endpoint called for: {session_id}")
     try:
         conversations_dir = "conversations"
-        agent_types = [
-            "casual_agent",
-            "code_agent",
-            "file_agent",
-            "browser_agent",
-            "planner_agent",
+        filepaths = [
+            os.path.join(conversations_dir, agent_type, f"memory_{session_id}.txt")
+            for agent_type in AGENT_TYPES
         ]
+        results = await asyncio.gather(
+            *(aiofiles.os.remove(filepath) for filepath in filepaths),
+            return_exceptions=True,
+        )
         deleted_count = 0
-
-        for agent_type in agent_types:
-            filepath = os.path.join(
-                conversations_dir, agent_type, f"memory_{session_id}.txt"
-            )
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                deleted_count += 1
-                logger.info(f"Deleted session file: {filepath}")
+        for filepath, result in zip(filepaths, results):
+            if isinstance(result, FileNotFoundError):
+                continue
+            if isinstance(result, Exception):
+                raise result
+            deleted_count += 1
+            logger.info(f"Deleted session file: {filepath}")
 
         if deleted_count == 0:
-            return JSONResponse(status_code=404, content={"error": "Session not found"})
+            return ORJSONResponse(
+                status_code=404, content={"error": "Session not found"}
+            )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "session_deleted",
@@ -506,12 +742,49 @@ async def delete_session(session_id: str):
         )
     except Exception as e:
         logger.error(f"Error deleting session {session_id}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 # ============ Workspace File Browser Endpoints ============
 
 WORKSPACE_DIR = "/opt/workspace"
+WORKSPACE_ROOT = Path(WORKSPACE_DIR).resolve()
+
+
+def resolve_workspace_path(path: str) -> str | None:
+    """Resolve a path inside the workspace, or None if it (or a symlink) escapes it."""
+    full_path = (WORKSPACE_ROOT / path).resolve()
+    if not full_path.is_relative_to(WORKSPACE_ROOT):
+        return None
+    return str(full_path)
+
+
+# Directory listings cached per path as (dir_mtime, cached_at, items)
+FILE_LIST_CACHE_TTL = 2.0
+file_list_cache = {}
+
+
+def scan_workspace_dir(full_path: str, safe_path: str) -> list:
+    """List a workspace directory, sorted with directories first."""
+    items = []
+    with os.scandir(full_path) as entries:
+        for entry in entries:
+            entry_stat = entry.stat()
+            items.append(
+                {
+                    "name": entry.name,
+                    "path": (
+                        os.path.join(safe_path, entry.name) if safe_path else entry.name
+                    ),
+                    "is_dir": entry.is_dir(),
+                    "size": entry_stat.st_size if entry.is_file() else None,
+                    "modified": entry_stat.st_mtime,
+                }
+            )
+
+    # Sort: directories first, then by name
+    items.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
+    return items
 
 
 @api.get("/files")
@@ -519,39 +792,42 @@ async def list_workspace_files(path: str = ""):
     """List files and folders in the workspace directory."""
     logger.info(f"List files endpoint called for path: {path}")
     try:
-        # Sanitize path to prevent directory traversal
-        safe_path = os.path.normpath(path).lstrip("/\\")
-        if ".." in safe_path:
-            return JSONResponse(status_code=400, content={"error": "Invalid path"})
-
-        full_path = os.path.join(WORKSPACE_DIR, safe_path)
+        # Sanitize path, rejecting absolute and drive-letter paths upfront
+        if path.startswith(("/", "\\")) or ":" in path[:3]:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
+        safe_path = os.path.normpath(path)
+        full_path = resolve_workspace_path(safe_path)
+        if full_path is None:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
 
-        if not os.path.exists(full_path):
-            return JSONResponse(status_code=404, content={"error": "Path not found"})
+        try:
+            dir_stat = await asyncio.to_thread(os.stat, full_path)
+        except FileNotFoundError:
+            return ORJSONResponse(status_code=404, content={"error": "Path not found"})
 
-        if not os.path.isdir(full_path):
-            return JSONResponse(
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            return ORJSONResponse(
                 status_code=400, content={"error": "Path is not a directory"}
             )
 
-        items = []
-        for item in os.listdir(full_path):
-            item_path = os.path.join(full_path, item)
-            stat = os.stat(item_path)
-            items.append(
-                {
-                    "name": item,
-                    "path": os.path.join(safe_path, item) if safe_path else item,
-                    "is_dir": os.path.isdir(item_path),
-                    "size": stat.st_size if os.path.isfile(item_path) else None,
-                    "modified": stat.st_mtime,
-                }
+        # The directory mtime changes on add/remove/rename; the TTL covers
+        # size and mtime changes of the files themselves
+        cached = file_list_cache.get(safe_path)
+        if (
+            cached
+            and cached[0] == dir_stat.st_mtime_ns
+            and time.monotonic() - cached[1] < FILE_LIST_CACHE_TTL
+        ):
+            items = cached[2]
+        else:
+            items = await asyncio.to_thread(scan_workspace_dir, full_path, safe_path)
+            file_list_cache[safe_path] = (
+                dir_stat.st_mtime_ns,
+                time.monotonic(),
+                items,
             )
 
-        # Sort: directories first, then by name
-        items.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
-
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "path": safe_path,
@@ -561,7 +837,7 @@ async def list_workspace_files(path: str = ""):
         )
     except Exception as e:
         logger.error(f"Error listing files: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.get("/files/view")
@@ -569,25 +845,28 @@ async def view_file_content(path: str):
     """View the contents of a text file."""
     logger.info(f"View file endpoint called for: {path}")
     try:
-        # Sanitize path
-        safe_path = os.path.normpath(path).lstrip("/\\")
-        if ".." in safe_path:
-            return JSONResponse(status_code=400, content={"error": "Invalid path"})
-
-        full_path = os.path.join(WORKSPACE_DIR, safe_path)
+        # Sanitize path, rejecting absolute and drive-letter paths upfront
+        if path.startswith(("/", "\\")) or ":" in path[:3]:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
+        safe_path = os.path.normpath(path)
+        full_path = resolve_workspace_path(safe_path)
+        if full_path is None:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
 
-        if not os.path.exists(full_path):
-            return JSONResponse(status_code=404, content={"error": "File not found"})
+        try:
+            file_stat = await asyncio.to_thread(os.stat, full_path)
+        except FileNotFoundError:
+            return ORJSONResponse(status_code=404, content={"error": "File not found"})
 
-        if os.path.isdir(full_path):
-            return JSONResponse(
+        if stat.S_ISDIR(file_stat.st_mode):
+            return ORJSONResponse(
                 status_code=400, content={"error": "Cannot view directory"}
             )
 
         # Check file size (limit to 1MB for text viewing)
-        file_size = os.path.getsize(full_path)
+        file_size = file_stat.st_size
         if file_size > 1024 * 1024:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "error": "File too large to view",
@@ -598,8 +877,8 @@ async def view_file_content(path: str):
 
         # Try to read as text
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
+                content = await f.read()
 
             # Detect file type
             ext = os.path.splitext(full_path)[1].lower()
@@ -619,7 +898,7 @@ async def view_file_content(path: str):
             elif ext in [".sh"]:
                 file_type = "shell"
 
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=200,
                 content={
                     "path": safe_path,
@@ -630,7 +909,7 @@ async def view_file_content(path: str):
                 },
             )
         except UnicodeDecodeError:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "error": "Binary file cannot be viewed as text",
@@ -639,39 +918,62 @@ async def view_file_content(path: str):
             )
     except Exception as e:
         logger.error(f"Error viewing file: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 from fastapi.responses import FileResponse
 
+# Files above this size are streamed in chunks instead of served with FileResponse
+STREAM_DOWNLOAD_THRESHOLD = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def stream_file(path: str):
+    """Yield a file's content in chunks without blocking the event loop."""
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
 
 @api.get("/files/download")
 async def download_file(path: str):
     """Download a file from the workspace."""
     logger.info(f"Download file endpoint called for: {path}")
     try:
-        # Sanitize path
-        safe_path = os.path.normpath(path).lstrip("/\\")
-        if ".." in safe_path:
-            return JSONResponse(status_code=400, content={"error": "Invalid path"})
+        # Sanitize path, rejecting absolute and drive-letter paths upfront
+        if path.startswith(("/", "\\")) or ":" in path[:3]:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
+        safe_path = os.path.normpath(path)
+        full_path = resolve_workspace_path(safe_path)
+        if full_path is None:
+            return ORJSONResponse(status_code=400, content={"error": "Invalid path"})
 
-        full_path = os.path.join(WORKSPACE_DIR, safe_path)
-
-        if not os.path.exists(full_path):
-            return JSONResponse(status_code=404, content={"error": "File not found"})
+        try:
+            file_stat = await asyncio.to_thread(os.stat, full_path)
+        except FileNotFoundError:
+            return ORJSONResponse(status_code=404, content={"error": "File not found"})
 
-        if os.path.isdir(full_path):
-            return JSONResponse(
+        if stat.S_ISDIR(file_stat.st_mode):
+            return ORJSONResponse(
                 status_code=400, content={"error": "Cannot download directory"}
             )
 
         filename = os.path.basename(full_path)
+        if file_stat.st_size > STREAM_DOWNLOAD_THRESHOLD:
+            return StreamingResponse(
+                stream_file(full_path),
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+                    "Content-Length": str(file_stat.st_size),
+                },
+            )
         return FileResponse(
             path=full_path, filename=filename, media_type="application/octet-stream"
         )
     except Exception as e:
         logger.error(f"Error downloading file: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 # LLM Settings Models
@@ -692,7 +994,7 @@ async def get_llm_settings():
     """Get current LLM provider settings from config.ini"""
     logger.info("Getting LLM settings")
     try:
-        config.read("config.ini")
+        config = get_config()
         return {
             "provider_name": config.get("MAIN", "provider_name", fallback="lm-studio"),
             "provider_model": config.get("MAIN", "provider_model", fallback=""),
@@ -703,15 +1005,16 @@ async def get_llm_settings():
         }
     except Exception as e:
         logger.error(f"Error reading config: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.post("/llm/settings")
 async def save_llm_settings(settings: LLMSettings):
     """Save LLM provider settings to config.ini"""
+    global config_mtime
     logger.info(f"Saving LLM settings: {settings}")
     try:
-        config.read("config.ini")
+        config = get_config()
         config.set("MAIN", "provider_name", settings.provider_name)
         config.set("MAIN", "provider_model", settings.provider_model)
         config.set("MAIN", "provider_server_address", settings.provider_server_address)
@@ -719,6 +1022,7 @@ async def save_llm_settings(settings: LLMSettings):
 
         with open("config.ini", "w") as configfile:
             config.write(configfile)
+        config_mtime = os.stat("config.ini").st_mtime_ns
 
         logger.info("LLM settings saved successfully")
         return {
@@ -727,7 +1031,7 @@ async def save_llm_settings(settings: LLMSettings):
         }
     except Exception as e:
         logger.error(f"Error saving config: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 @api.post("/llm/check-connection")
@@ -757,7 +1061,7 @@ async def check_llm_connection(request: ConnectionCheckRequest):
         if request.provider_name == "lm-studio":
             # LM Studio uses OpenAI-compatible API
             url = f"{server_address}/v1/models"
-            response = requests.get(url, timeout=10)
+            response = await http_client.get(url)
             if response.status_code == 200:
                 data = response.json()
                 models = [
@@ -782,7 +1086,7 @@ async def check_llm_connection(request: ConnectionCheckRequest):
                 if not server_address.startswith("http")
                 else f"{server_address}/api/tags"
             )
-            response = requests.get(url, timeout=10)
+            response = await http_client.get(url)
             if response.status_code == 200:
                 data = response.json()
                 models = [m.get("name", "unknown") for m in data.get("models", [])]
@@ -805,7 +1109,7 @@ async def check_llm_connection(request: ConnectionCheckRequest):
                 if not server_address.endswith("/v1/models")
                 else server_address
             )
-            response = requests.get(url, timeout=10)
+            response = await http_client.get(url)
             if response.status_code == 200:
                 data = response.json()
                 models = [
@@ -823,14 +1127,14 @@ async def check_llm_connection(request: ConnectionCheckRequest):
                     "models": [],
                 }
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.warning(f"Connection timeout to {server_address}")
         return {
             "connected": False,
             "message": "Connection timed out. Is the server running?",
             "models": [],
         }
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         logger.warning(f"Connection error to {server_address}: {str(e)}")
         return {
             "connected": False,
@@ -842,47 +1146,124 @@ async def check_llm_connection(request: ConnectionCheckRequest):
         return {"connected": False, "message": f"Error: {str(e)}", "models": []}
 
 
-@api.get("/latest_answer")
-async def get_latest_answer():
-    global query_resp_history
+# Replaced by a fresh event each time an agent updates its answer, so every
+# waiter that captured the previous event is woken exactly once
+answer_event = asyncio.Event()
+event_loop = None
+
+
+# Answers pushed to streaming clients as (seq, payload), every subscriber keeps
+# the seq it last sent instead of consuming answers shared with other clients
+ANSWER_LOG_MAX = 256
+answer_log = deque(maxlen=ANSWER_LOG_MAX)
+answer_seq = 0
+
+
+def signal_answer_update() -> None:
+    global answer_event
+    answer_event.set()
+    answer_event = asyncio.Event()
+
+
+def publish_answer(query_resp: dict) -> None:
+    """Append an answer to the answer log and wake the streaming clients."""
+    global answer_seq
+    answer_seq += 1
+    answer_log.append((answer_seq, query_resp))
+    signal_answer_update()
+
+
+def publish_agent_answer(query_resp: dict) -> None:
+    """Publish an in-progress answer unless it repeats the last published one."""
+    if answer_log and answer_log[-1][1]["answer"] == query_resp["answer"]:
+        return
+    publish_answer(query_resp)
+
+
+def answers_since(seq: int) -> list:
+    """Return the (seq, payload) pairs published after seq."""
+    return [entry for entry in answer_log if entry[0] > seq]
+
+
+def agent_answer_payload(agent) -> dict:
+    """Build the payload of an agent answer that is still in progress."""
+    return {
+        "done": "false",
+        "answer": agent.last_answer,
+        "reasoning": agent.last_reasoning,
+        "agent_name": agent.agent_name,
+        "success": agent.success,
+        "blocks": {
+            str(i): block.jsonify()
+            for i, block in enumerate(interaction.get_last_blocks_result())
+        },
+        "status": agent.get_status_message,
+        "uid": uuid.uuid4().hex,
+    }
+
+
+def notify_answer_update(agent) -> None:
+    """Agent answer callback, safe to call from executor threads."""
+    # Built right away, the answer may be cleared before the loop runs
+    if event_loop is not None and agent.last_answer:
+        event_loop.call_soon_threadsafe(
+            publish_agent_answer, agent_answer_payload(agent)
+        )
+
+
+@api.on_event("startup")
+async def register_answer_callbacks():
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    for agent in interaction.agents:
+        agent.answer_callback = partial(notify_answer_update, agent)
+
+
+def build_latest_answer() -> dict | None:
+    """Build the payload of the current agent answer if it was not polled yet."""
     if interaction.current_agent is None:
-        return JSONResponse(status_code=404, content={"error": "No agent available"})
-    uid = str(uuid.uuid4())
-    if not any(
-        q["answer"] == interaction.current_agent.last_answer for q in query_resp_history
-    ):
-        query_resp = {
-            "done": "false",
-            "answer": interaction.current_agent.last_answer,
-            "reasoning": interaction.current_agent.last_reasoning,
-            "agent_name": (
-                interaction.current_agent.agent_name
-                if interaction.current_agent
-                else "None"
-            ),
-            "success": interaction.current_agent.success,
-            "blocks": (
-                {
-                    f"{i}": block.jsonify()
-                    for i, block in enumerate(interaction.get_last_blocks_result())
-                }
-                if interaction.current_agent
-                else {}
-            ),
-            "status": (
-                interaction.current_agent.get_status_message
-                if interaction.current_agent
-                else "No status available"
-            ),
-            "uid": uid,
-        }
+        return None
+    if answer_digest(interaction.current_agent.last_answer) not in seen_answers:
+        query_resp = agent_answer_payload(interaction.current_agent)
         interaction.current_agent.last_answer = ""
         interaction.current_agent.last_reasoning = ""
         query_resp_history.append(query_resp)
-        return JSONResponse(status_code=200, content=query_resp)
+        remember_answer(query_resp["answer"])
+        return query_resp
+    return None
+
+
+@api.get("/latest_answer")
+async def get_latest_answer():
+    if interaction.current_agent is None:
+        return ORJSONResponse(status_code=404, content={"error": "No agent available"})
+    query_resp = build_latest_answer()
+    if query_resp:
+        return ORJSONResponse(status_code=200, content=query_resp)
     if query_resp_history:
-        return JSONResponse(status_code=200, content=query_resp_history[-1])
-    return JSONResponse(status_code=404, content={"error": "No answer available"})
+        return ORJSONResponse(status_code=200, content=query_resp_history[-1])
+    return ORJSONResponse(status_code=404, content={"error": "No answer available"})
+
+
+@api.get("/latest_answer/stream")
+async def stream_latest_answer():
+    """Push each new answer as a Server-Sent Event instead of being polled."""
+
+    async def event_stream():
+        # Start with the latest answer, as a first poll of /latest_answer would
+        last_seq = answer_seq - 1
+        while True:
+            # Capture the event before checking so an update in between is not missed
+            event = answer_event
+            for seq, query_resp in answers_since(last_seq):
+                last_seq = seq
+                yield f"id: {seq}\ndata: {orjson.dumps(query_resp).decode()}\n\n"
+            try:
+                await asyncio.wait_for(event.wait(), timeout=25)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 async def think_wrapper(interaction, query):
@@ -907,11 +1288,22 @@ async def think_wrapper(interaction, query):
         raise e
 
 
-@api.post("/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
-    global is_generating, query_resp_history
-    logger.info(f"Processing query: {request.query}")
-    query_resp = QueryResponse(
+# Returned as is while another query holds query_lock
+_BUSY_RESP = {
+    "done": "false",
+    "answer": "",
+    "reasoning": "",
+    "agent_name": "Unknown",
+    "success": "false",
+    "blocks": {},
+    "status": "Busy",
+    "uid": "",
+}
+
+
+def new_query_response() -> QueryResponse:
+    # Fields are set by this module only, skip pydantic validation
+    return QueryResponse.model_construct(
         done="false",
         answer="",
         reasoning="",
@@ -919,32 +1311,68 @@ async def process_query(request: QueryRequest):
         success="false",
         blocks={},
         status="Ready",
-        uid=str(uuid.uuid4()),
+        uid=uuid.uuid4().hex,
     )
-    if is_generating:
-        logger.warning("Another query is being processed, please wait.")
-        return JSONResponse(status_code=429, content=query_resp.jsonify())
 
+
+def record_cached_answer(query: str, query_resp_dict: dict) -> None:
+    """Record a semantic cache hit like an answer the agents just gave."""
+    agent = next(
+        (
+            a
+            for a in interaction.agents
+            if a.agent_name == query_resp_dict["agent_name"]
+        ),
+        interaction.current_agent,
+    )
+    if agent is not None:
+        agent.memory.push("user", query)
+        agent.memory.push("assistant", query_resp_dict["answer"])
+    interaction.last_query = query
+    interaction.last_answer = query_resp_dict["answer"]
+    interaction.last_reasoning = query_resp_dict["reasoning"]
+    interaction.last_success = True
+    query_resp_history.append(query_resp_dict)
+    remember_answer(query_resp_dict["answer"])
+    publish_answer(query_resp_dict)
+
+
+async def run_query(query: str) -> Tuple[int, dict]:
+    """Run a query through the agents, the caller must hold query_lock."""
+    # A stop requested by /stop or /reset only applies to the query it interrupted
+    for agent in interaction.agents:
+        agent.stop = False
+    query_resp = new_query_response()
+    query_vector = None
     try:
-        is_generating = True
-        success = await think_wrapper(interaction, request.query)
-        is_generating = False
+        if semantic_cache:
+            # Embedded once, reused to cache the answer on a miss
+            query_vector = await asyncio.to_thread(semantic_cache.embed, query)
+            cached_resp = await asyncio.to_thread(
+                semantic_cache.lookup, query, query_vector
+            )
+            if cached_resp:
+                logger.info("Semantic cache hit, skipping agents")
+                query_resp_dict = {**cached_resp, "uid": query_resp.uid}
+                record_cached_answer(query, query_resp_dict)
+                return 200, query_resp_dict
+        success = await think_wrapper(interaction, query)
 
         if not success:
             query_resp.answer = interaction.last_answer
             query_resp.reasoning = interaction.last_reasoning
-            return JSONResponse(status_code=400, content=query_resp.jsonify())
+            return 400, query_resp.jsonify()
 
         if interaction.current_agent:
             blocks_json = {
-                f"{i}": block.jsonify()
+                str(i): block.jsonify()
                 for i, block in enumerate(interaction.current_agent.get_blocks_result())
             }
         else:
             logger.error("No current agent found")
             blocks_json = {}
             query_resp.answer = "Error: No current agent"
-            return JSONResponse(status_code=400, content=query_resp.jsonify())
+            return 400, query_resp.jsonify()
 
         logger.info(f"Answer: {interaction.last_answer}")
         logger.info(f"Blocks: {blocks_json}")
@@ -955,34 +1383,124 @@ async def process_query(request: QueryRequest):
         query_resp.success = str(interaction.last_success)
         query_resp.blocks = blocks_json
 
-        query_resp_dict = {
-            "done": query_resp.done,
-            "answer": query_resp.answer,
-            "agent_name": query_resp.agent_name,
-            "success": query_resp.success,
-            "blocks": query_resp.blocks,
-            "status": query_resp.status,
-            "uid": query_resp.uid,
-        }
+        query_resp_dict = query_resp.jsonify()
         query_resp_history.append(query_resp_dict)
+        remember_answer(query_resp_dict["answer"])
+        publish_answer(query_resp_dict)
+
+        if semantic_cache:
+            await asyncio.to_thread(
+                semantic_cache.add, query, query_resp_dict, query_vector
+            )
 
         logger.info("Query processed successfully")
-        return JSONResponse(status_code=200, content=query_resp.jsonify())
+        return 200, query_resp_dict
     except Exception as e:
-        is_generating = False  # Reset flag on error to prevent 429 lockout
         logger.error(f"An error occurred: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": str(e),
-                "message": "An unexpected error occurred processing the query.",
-            },
-        )
+        return 500, {
+            "error": str(e),
+            "message": "An unexpected error occurred processing the query.",
+        }
     finally:
-        is_generating = False  # Ensure flag is always reset
         logger.info("Processing finished")
-        if config.getboolean("MAIN", "save_session"):
-            interaction.save_session()
+        if SAVE_SESSION:
+            request_session_save()
+
+
+@api.post("/query", response_model=QueryResponse)
+async def process_query(request: QueryRequest):
+    logger.info(f"Processing query: {request.query}")
+    if query_lock.locked():
+        logger.warning("Another query is being processed, please wait.")
+        return ORJSONResponse(status_code=429, content=_BUSY_RESP)
+
+    async with query_lock:
+        status_code, content = await run_query(request.query)
+    return ORJSONResponse(status_code=status_code, content=content)
+
+
+# Streamed queries keep running when their client disconnects
+query_tasks = set()
+
+
+@api.post("/query/stream")
+async def stream_query(request: QueryRequest):
+    """
+    Process a query, streaming answers as NDJSON lines.
+    Providers return whole completions, so intermediate lines are the agents'
+    intermediate answers (e.g. planner steps) rather than tokens; the last
+    line is the payload /query would return.
+    """
+    logger.info(f"Streaming query: {request.query}")
+    if query_lock.locked():
+        logger.warning("Another query is being processed, please wait.")
+        return ORJSONResponse(status_code=429, content=_BUSY_RESP)
+
+    # Free, so this returns at once and no other query can take the lock
+    # before the task below starts
+    await query_lock.acquire()
+    # Only answers published by this query are streamed
+    start_seq = answer_seq
+
+    async def locked_run_query() -> Tuple[int, dict]:
+        try:
+            return await run_query(request.query)
+        finally:
+            query_lock.release()
+
+    task = asyncio.create_task(locked_run_query())
+    query_tasks.add(task)
+    task.add_done_callback(query_tasks.discard)
+
+    async def line_stream():
+        last_seq = start_seq
+        while True:
+            # Capture the event before checking so an update in between is not missed
+            event = answer_event
+            for seq, query_resp in answers_since(last_seq):
+                last_seq = seq
+                # The final answer is sent last, from the task result
+                if query_resp["done"] == "false":
+                    yield orjson.dumps(query_resp) + b"\n"
+            if task.done():
+                break
+            waiter = asyncio.ensure_future(event.wait())
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+        _, content = task.result()
+        yield orjson.dumps(content) + b"\n"
+
+    return StreamingResponse(line_stream(), media_type="application/x-ndjson")
+
+
+@api.post("/query/async")
+async def enqueue_query(request: QueryRequest):
+    """Queue a query on a Celery worker and return its task id."""
+    logger.info(f"Queueing query: {request.query}")
+    try:
+        task = await asyncio.to_thread(process_query_task.delay, request.query)
+        return ORJSONResponse(status_code=202, content={"task_id": task.id})
+    except Exception as e:
+        logger.error(f"Error queueing query: {e}")
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
+
+
+def get_task_status(task_id: str) -> dict:
+    """Fetch a task state and result from the Celery result backend."""
+    result = AsyncResult(task_id, app=celery_app)
+    status = {"task_id": task_id, "state": result.state, "result": None}
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["result"] = {"error": str(result.result)}
+    return status
+
+
+@api.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Get the state and, once finished, the result of a queued query."""
+    status = await asyncio.to_thread(get_task_status, task_id)
+    return ORJSONResponse(status_code=200, content=status)
 
 
 if __name__ == "__main__":
@@ -997,4 +1515,18 @@ if __name__ == "__main__":
         port = int(envport)
     else:
         port = 7777
-    uvicorn.run(api, host="0.0.0.0", port=7777)
+    # uvicorn only logs warnings, so announce the port here
+    print(f"[AgenticSeek] Listening on port {port}")
+    # Every worker process builds its own Interaction (and browser), so keep a
+    # single worker unless queries go through the shared Celery path (/query/async)
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    uvicorn.run(
+        api if workers == 1 else "api:api",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
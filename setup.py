@@ -17,9 +17,13 @@ setup(
     install_requires=[
         "fastapi>=0.115.12",
         "celery>=5.5.1",
+        "redis>=5.0.1",
         "uvicorn>=0.34.0",
+        "uvloop>=0.21.0; sys_platform != 'win32'",
+        "httptools>=0.6.4",
         "flask>=3.1.0",
         "aiofiles>=24.1.0",
+        "orjson>=3.10.0",
         "pydantic>=2.10.6",
         "pydantic_core>=2.27.2",
         "requests>=2.31.0",
@@ -1,5 +1,6 @@
 from typing import Tuple, Callable
 from abc import abstractmethod
+from functools import lru_cache
 import os
 import random
 import time
@@ -14,6 +15,25 @@ from sources.schemas import executorResult
 random.seed(time.time())
 
 
+@lru_cache(maxsize=None)
+def read_prompt(file_path: str) -> str:
+    """
+    Read a prompt file, cached so agents built again do not re-read it.
+    Call read_prompt.cache_clear() after editing prompts at runtime.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found at path: {file_path}")
+    except PermissionError:
+        raise PermissionError(
+            f"Permission denied to read prompt file at path: {file_path}"
+        )
+    except Exception as e:
+        raise e
+
+
 class Agent:
     """
     An abstract class for all agents.
@@ -42,6 +62,7 @@ class Agent:
         self.tools = {}
         self.blocks_result = []
         self.success = True
+        self.answer_callback = None
         self.last_answer = ""
         self.last_reasoning = ""
         self.status_message = "Haven't started yet"
@@ -65,6 +86,19 @@ class Agent:
     def get_last_answer(self) -> str:
         return self.last_answer
 
+    @property
+    def last_answer(self) -> str:
+        return self._last_answer
+
+    @last_answer.setter
+    def last_answer(self, answer: str) -> None:
+        """
+        Set the last answer and notify the answer callback, if any, of the update.
+        """
+        self._last_answer = answer
+        if self.answer_callback is not None:
+            self.answer_callback()
+
     @property
     def get_last_reasoning(self) -> str:
         return self.last_reasoning
@@ -109,17 +143,7 @@ class Agent:
         return description
 
     def load_prompt(self, file_path: str) -> str:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Prompt file not found at path: {file_path}")
-        except PermissionError:
-            raise PermissionError(
-                f"Permission denied to read prompt file at path: {file_path}"
-            )
-        except Exception as e:
-            raise e
+        return read_prompt(file_path)
 
     def request_stop(self) -> None:
         """
@@ -1,5 +1,12 @@
+import ast
 import json
+import re
+import asyncio
+from collections import deque
 from typing import List, Tuple, Type, Dict
+
+import orjson
+
 from sources.utility import pretty_print, animate_thinking
 from sources.agents.agent import Agent
 from sources.agents.code_agent import CoderAgent
@@ -11,11 +18,48 @@ from sources.tools.tools import Tools
 from sources.logger import Logger
 from sources.memory import Memory
 
+PLAN_CACHE_SIZE = 256
+PLAN_CACHE_MIN_OVERLAP = 0.6
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+# Keyword patterns used to guess the agent of a text-only task, in priority order
+_TEXT_TASK_AGENTS = (
+    ("Coder", re.compile(r"code|script|python", re.IGNORECASE)),
+    ("Web", re.compile(r"search|web|internet", re.IGNORECASE)),
+    ("File", re.compile(r"file|folder", re.IGNORECASE)),
+)
+# Lines starting with a digit or containing '##', ignoring surrounding whitespace
+_TASK_NAME_RE = re.compile(r"^[^\S\n]*(?:\d|[^\n]*##)[^\n]*$", re.MULTILINE)
+# Task ids of typical plans, to avoid formatting the same small ints again
+_ID_STRS = tuple(str(i) for i in range(256))
+_STOPWORDS = frozenset(
+    "the and for with that this from into your you are can please make find "
+    "then also about what how will want need have has was were its".split()
+)
+
+
+def id_str(n: int) -> str:
+    """Return the task id string of a plan step number."""
+    return _ID_STRS[n] if n < len(_ID_STRS) else str(n)
+
+
+def extract_keywords(text: str) -> frozenset:
+    """Extract the set of meaningful lowercase words of a text."""
+    return frozenset(_WORD_RE.findall(text.lower())) - _STOPWORDS
+
 
 class PlannerAgent(Agent):
-    def __init__(self, name, prompt_path, provider, verbose=False, browser=None):
+    def __init__(
+        self,
+        name,
+        prompt_path,
+        provider,
+        verbose=False,
+        browser=None,
+        plan_adapter=None,
+    ):
         """
         The planner agent is a special agent that divides and conquers the task.
+        plan_adapter is an optional (smaller) provider used to adapt cached plans of similar goals.
         """
         super().__init__(name, prompt_path, provider, verbose, None)
         self.tools = {"json": Tools()}
@@ -48,6 +92,8 @@ class PlannerAgent(Agent):
             model_provider=provider.get_model_name(),
         )
         self.logger = Logger("planner_agent.log")
+        self.plan_adapter = plan_adapter
+        self.plan_cache = deque(maxlen=PLAN_CACHE_SIZE)
 
     def get_task_names(self, text: str) -> List[str]:
         """
@@ -59,17 +105,7 @@ class PlannerAgent(Agent):
         Returns:
             List[str]: A list of extracted task names that meet the specified criteria.
         """
-        tasks_names = []
-        lines = text.strip().split("\n")
-        for line in lines:
-            if line is None:
-                continue
-            line = line.strip()
-            if len(line) == 0:
-                continue
-            if "##" in line or line[0].isdigit():
-                tasks_names.append(line)
-                continue
+        tasks_names = [line.strip() for line in _TASK_NAME_RE.findall(text)]
         self.logger.info(f"Found {len(tasks_names)} tasks names.")
         return tasks_names
 
@@ -87,8 +123,6 @@ class PlannerAgent(Agent):
 
         self.logger.info(f"Raw plan text from LLM:\n{text}")
 
-        import ast
-
         try:
             blocks, _ = self.tools["json"].load_exec_block(text)
             if not blocks:
@@ -113,8 +147,8 @@ class PlannerAgent(Agent):
                     )
 
                     try:
-                        line_json = json.loads(clean_block)
-                    except json.JSONDecodeError:
+                        line_json = orjson.loads(clean_block)
+                    except orjson.JSONDecodeError:
                         self.logger.warning(
                             "JSON decode failed, attempting ast.literal_eval."
                         )
@@ -126,9 +160,12 @@ class PlannerAgent(Agent):
                             )
 
                     if "plan" in line_json:
+                        valid_agents = frozenset(k.lower() for k in self.agents.keys())
                         for task in line_json["plan"]:
+                            task_text = task.get("task")
+                            if not task_text:
+                                continue
                             agent_name = task.get("agent", "").lower()
-                            valid_agents = [k.lower() for k in self.agents.keys()]
                             if agent_name == "planner":
                                 agent_name = "casual"
                             if agent_name not in valid_agents:
@@ -136,17 +173,14 @@ class PlannerAgent(Agent):
                                     f"Agent {task.get('agent')} does not exist. mapping to casual."
                                 )
                                 task["agent"] = "Casual"
-                            try:
-                                agent = {
-                                    "agent": task.get("agent", "Casual"),
-                                    "id": task.get("id", str(len(tasks) + 1)),
-                                    "task": task["task"],
-                                }
-                                if "need" in task:
-                                    agent["need"] = task["need"]
-                                tasks.append(agent)
-                            except Exception:
-                                continue
+                            agent = {
+                                "agent": task.get("agent", "Casual"),
+                                "id": task.get("id", id_str(len(tasks) + 1)),
+                                "task": task_text,
+                            }
+                            if "need" in task:
+                                agent["need"] = task["need"]
+                            tasks.append(agent)
                 except Exception as e:
                     self.logger.error(f"Parsing error for block: {e}")
                     continue
@@ -168,21 +202,21 @@ class PlannerAgent(Agent):
                 color="warning",
             )
             for i, task_name in enumerate(tasks_names):
-                agent_type = "Casual"
-                t_lower = task_name.lower()
-                if "code" in t_lower or "script" in t_lower or "python" in t_lower:
-                    agent_type = "Coder"
-                elif "search" in t_lower or "web" in t_lower or "internet" in t_lower:
-                    agent_type = "Web"
-                elif "file" in t_lower or "folder" in t_lower:
-                    agent_type = "File"
+                agent_type = next(
+                    (
+                        agent
+                        for agent, pattern in _TEXT_TASK_AGENTS
+                        if pattern.search(task_name)
+                    ),
+                    "Casual",
+                )
 
                 tasks.append(
                     {
                         "agent": agent_type,
-                        "id": str(i + 1),
+                        "id": id_str(i + 1),
                         "task": task_name,
-                        "need": [str(i)] if i > 0 else [],
+                        "need": [id_str(i)] if i > 0 else [],
                     }
                 )
 
@@ -282,7 +316,88 @@ class PlannerAgent(Agent):
             return []
 
         self.logger.info(f"Plan made:\n{answer}")
-        return self.parse_agent_tasks(answer)
+        return agents_tasks
+
+    def find_cached_plan(self, goal: str) -> str | None:
+        """
+        Finds the cached plan whose goal keywords overlap the most with the new goal.
+        Args:
+            goal (str): The goal to be achieved.
+        Returns:
+            str | None: The JSON plan template, or None if no cached goal is similar enough.
+        """
+        keywords = extract_keywords(goal)
+        if not keywords:
+            return None
+        best_score, best_plan = 0.0, None
+        for cached_keywords, plan_template in self.plan_cache:
+            score = len(keywords & cached_keywords) / len(keywords | cached_keywords)
+            if score > best_score:
+                best_score, best_plan = score, plan_template
+        if best_score < PLAN_CACHE_MIN_OVERLAP:
+            return None
+        self.logger.info(f"Cached plan found (overlap {best_score:.2f}) for: {goal}")
+        return best_plan
+
+    def cache_plan(self, goal: str, agents_tasks: List[dict]) -> None:
+        """
+        Stores a plan as a template for future similar goals.
+        Args:
+            goal (str): The goal the plan was made for.
+            agents_tasks (list): The tasks of the plan.
+        """
+        keywords = extract_keywords(goal)
+        if not keywords or agents_tasks == []:
+            return
+        plan_template = json.dumps({"plan": [task for _, task in agents_tasks]})
+        self.plan_cache.append((keywords, plan_template))
+
+    async def adapt_cached_plan(self, goal: str) -> List[dict]:
+        """
+        Adapts the cached plan of a similar goal using the plan adapter provider.
+        Args:
+            goal (str): The goal to be achieved.
+        Returns:
+            list: The adapted plan, or an empty list if no cached plan could be used.
+        """
+        if self.plan_adapter is None:
+            return []
+        plan_template = self.find_cached_plan(goal)
+        if plan_template is None:
+            return []
+        self.status_message = "Adapting a previous plan..."
+        prompt = f"""
+        A plan was previously made for a similar goal:
+        ```json
+        {plan_template}
+        ```
+        Adapt this plan to the new goal: {goal}
+        Keep the same structure and agents unless the new goal requires otherwise.
+        Write down the adapted plan within ```json.
+        """
+        history = [
+            self.memory.get()[0],
+            {"role": "user", "content": prompt},
+        ]
+        try:
+            loop = asyncio.get_event_loop()
+            thought = await loop.run_in_executor(
+                self.executor, self.plan_adapter.respond, history, False
+            )
+        except Exception as e:
+            self.logger.warning(f"Plan adaptation failed: {e}")
+            return []
+        answer = self.remove_reasoning_text(thought)
+        agents_tasks = self.parse_agent_tasks(answer)
+        if agents_tasks == []:
+            self.logger.warning(
+                "Adapted plan could not be parsed, planning from scratch."
+            )
+            return []
+        self.memory.push("user", goal)
+        self.memory.push("assistant", answer)
+        self.show_plan(agents_tasks, answer)
+        return agents_tasks
 
     async def update_plan(
         self,
@@ -356,18 +471,17 @@ class PlannerAgent(Agent):
             str: The result of the agent process.
         """
         self.status_message = f"Starting task {task['task']}..."
+        agent = self.agents[task["agent"].lower()]
         agent_prompt = self.make_prompt(task["task"], required_infos)
         pretty_print(f"Agent {task['agent']} started working...", color="status")
         self.logger.info(f"Agent {task['agent']} started working on {task['task']}.")
-        answer, reasoning = await self.agents[task["agent"].lower()].process(
-            agent_prompt, None
-        )
+        answer, reasoning = await agent.process(agent_prompt, None)
         self.last_answer = answer
         self.last_reasoning = reasoning
-        self.blocks_result = self.agents[task["agent"].lower()].blocks_result
-        agent_answer = self.agents[task["agent"].lower()].raw_answer_blocks(answer)
-        success = self.agents[task["agent"].lower()].get_success
-        self.agents[task["agent"].lower()].show_answer()
+        self.blocks_result = agent.blocks_result
+        agent_answer = agent.raw_answer_blocks(answer)
+        success = agent.get_success
+        agent.show_answer()
         pretty_print(f"Agent {task['agent']} completed task.", color="status")
         self.logger.info(
             f"Agent {task['agent']} finished working on {task['task']}. Success: {success}"
@@ -400,18 +514,25 @@ class PlannerAgent(Agent):
         agents_work_result = dict()
 
         self.status_message = "Making a plan..."
-        agents_tasks = await self.make_plan(goal)
+        agents_tasks = await self.adapt_cached_plan(goal)
+        new_plan = agents_tasks == []
+        if new_plan:
+            agents_tasks = await self.make_plan(goal)
 
         if agents_tasks == []:
             return "Failed to parse the tasks.", ""
+        initial_plan = agents_tasks
+        all_success = True
         i = 0
         steps = len(agents_tasks)
         while i < steps and not self.stop:
             task_name, task = agents_tasks[i][0], agents_tasks[i][1]
             self.status_message = "Starting agents..."
-            pretty_print(f"I will {task_name}.", color="info")
+            pretty_print(
+                f"I will {task_name}.\nAssigned agent {task['agent']} to {task_name}",
+                color="info",
+            )
             self.last_answer = f"I will {task_name.lower()}."
-            pretty_print(f"Assigned agent {task['agent']} to {task_name}", color="info")
             if speech_module:
                 speech_module.speak(
                     f"I will {task_name}. I assigned the {task['agent']} agent to the task."
@@ -425,6 +546,7 @@ class PlannerAgent(Agent):
                 answer, success = await self.start_agent_process(task, required_infos)
             except Exception as e:
                 raise e
+            all_success = all_success and success
             if self.stop:
                 pretty_print(f"Requested stop.", color="failure")
             agents_work_result[task["id"]] = answer
@@ -434,4 +556,6 @@ class PlannerAgent(Agent):
             steps = len(agents_tasks)
             i += 1
 
+        if new_plan and not self.stop and all_success:
+            self.cache_plan(goal, initial_plan)
         return answer, ""
@@ -243,6 +243,9 @@ class Memory:
     def get(self) -> list:
         return self.memory
 
+    def __len__(self) -> int:
+        return len(self.memory)
+
     def get_cuda_device(self) -> str:
         if torch.backends.mps.is_available():
             return "mps"
@@ -0,0 +1,105 @@
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModel
+
+from sources.utility import animate_thinking
+from sources.logger import Logger
+
+
+class SemanticCache:
+    """
+    SemanticCache stores the responses to past queries and returns a cached
+    response when a new query embedding is close enough to a stored one.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+        max_entries: int = 10000,
+    ):
+        """
+        Args:
+            model_name (str): Hugging Face model used to embed queries.
+            threshold (float): Minimum cosine similarity for a cache hit.
+            max_entries (int): Maximum number of cached responses, oldest are overwritten first.
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.tokenizer = None
+        self.model = None
+        self.vectors = None
+        self.responses = [None] * max_entries
+        self.size = 0
+        self.next_idx = 0
+        self.logger = Logger("semantic_cache.log")
+
+    def load_model(self) -> None:
+        """Load the embedding model on first use."""
+        animate_thinking("Loading semantic cache model...", color="status")
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModel.from_pretrained(self.model_name)
+        self.model.eval()
+        self.logger.info(f"Semantic cache model {self.model_name} loaded.")
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text into a normalized vector using mean pooling.
+        Args:
+            text (str): The text to embed.
+        Returns:
+            np.ndarray: The L2-normalized embedding.
+        """
+        if self.model is None:
+            self.load_model()
+        inputs = self.tokenizer(
+            text, return_tensors="pt", truncation=True, max_length=256
+        )
+        with torch.no_grad():
+            output = self.model(**inputs)
+        mask = inputs["attention_mask"].unsqueeze(-1).float()
+        pooled = (output.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1)
+        vector = pooled[0].numpy().astype(np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def lookup(self, query: str, vector: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """
+        Find the cached response of the most similar past query.
+        Args:
+            query (str): The user query.
+            vector (np.ndarray, optional): The query embedding, if already computed.
+        Returns:
+            Optional[Dict]: The cached response, or None if no query is similar enough.
+        """
+        if self.size == 0:
+            return None
+        if vector is None:
+            vector = self.embed(query)
+        scores = self.vectors[: self.size] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        self.logger.info(f"Semantic cache hit ({scores[best]:.3f}) for: {query}")
+        return self.responses[best]
+
+    def add(
+        self, query: str, response: Dict, vector: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Store the response to a query, overwriting the oldest entry when full.
+        Args:
+            query (str): The user query.
+            response (Dict): The response to return for similar queries.
+            vector (np.ndarray, optional): The query embedding, if already computed.
+        """
+        if vector is None:
+            vector = self.embed(query)
+        if self.vectors is None:
+            self.vectors = np.zeros((self.max_entries, vector.shape[0]), np.float32)
+        self.vectors[self.next_idx] = vector
+        self.responses[self.next_idx] = response
+        self.next_idx = (self.next_idx + 1) % self.max_entries
+        self.size = min(self.size + 1, self.max_entries)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Celery tasks for running agent queries outside of the API process.
+
+Queries sent to /query/async stay PENDING until a worker runs them, start one with:
+    celery -A tasks worker --loglevel=info
+or use the worker service of docker-compose.
+"""
+
+import asyncio
+import os
+
+from celery import Celery
+
+# Same Redis as the API session cache, set to redis://redis:6379/0 by docker-compose
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+celery_app = Celery("tasks", broker=REDIS_URL, backend=REDIS_URL)
+celery_app.conf.update(
+    task_track_started=True,
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    worker_concurrency=8,
+)
+
+
+@celery_app.task(bind=True, name="process_query")
+def process_query_task(self, query: str) -> dict:
+    """Run a query through the worker's own interaction and return the answer."""
+    # Imported lazily so each worker process builds its own interaction on first use
+    import api
+
+    interaction = api.interaction
+    try:
+        success = asyncio.run(api.think_wrapper(interaction, query))
+        agent = interaction.current_agent
+        return {
+            "done": "true",
+            "answer": interaction.last_answer,
+            "reasoning": interaction.last_reasoning,
+            "agent_name": agent.agent_name if agent else "Unknown",
+            "success": str(success),
+            "blocks": (
+                {
+                    str(i): block.jsonify()
+                    for i, block in enumerate(agent.get_blocks_result())
+                }
+                if agent
+                else {}
+            ),
+            "status": agent.get_status_message if agent else "No status available",
+            "uid": self.request.id,
+        }
+    finally:
+        if api.SAVE_SESSION:
+            interaction.save_session()
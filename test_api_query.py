@@ -2,6 +2,9 @@ import requests
 import json
 import time
 
+# Reuse one keep-alive connection across requests
+session = requests.Session()
+
 
 def test_query():
     url = "http://127.0.0.1:7777/query"
@@ -14,7 +17,7 @@ def test_query():
     try:
         start_time = time.time()
         # Increased timeout to accommodate the long thinking time of reasoning models
-        response = requests.post(url, json=payload, timeout=600)
+        response = session.post(url, json=payload, timeout=600)
         elapsed = time.time() - start_time
 
         print(f"Request finished in {elapsed:.2f} seconds.")
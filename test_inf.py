@@ -2,6 +2,9 @@ import requests
 import json
 import time
 
+# Reuse one keep-alive connection across requests
+session = requests.Session()
+
 
 def test_inference():
     url = "http://host.docker.internal:1234/v1/chat/completions"
@@ -20,7 +23,7 @@ def test_inference():
     print(f"Sending request to {url}...")
     start_time = time.time()
     try:
-        response = requests.post(
+        response = session.post(
             url, json=payload, timeout=60
         )  # Increased timeout for test
         elapsed = time.time() - start_time
@@ -73,6 +73,13 @@ class TestMemory(unittest.TestCase):
         memory_content = self.memory.get()
         self.assertEqual(len(memory_content), 2)
 
+    def test_len(self):
+        self.assertEqual(len(self.memory), 1)
+        self.memory.push("user", "Hello")
+        self.assertEqual(len(self.memory), 2)
+        self.memory.clear()
+        self.assertEqual(len(self.memory), 1)
+
     def test_reset(self):
         self.memory.push("user", "Hello")
         new_memory = [{"role": "system", "content": "New prompt"}]
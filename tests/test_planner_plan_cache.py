@@ -0,0 +1,98 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.agents.planner_agent import PlannerAgent, extract_keywords, PLAN_CACHE_SIZE
+from sources.logger import Logger
+
+GOAL = "search the latest python web frameworks and write a report"
+PLAN = [
+    ["search the web", {"agent": "Web", "id": "1", "task": "search the web", "need": []}],
+    ["write a report", {"agent": "Casual", "id": "2", "task": "write a report", "need": ["1"]}],
+]
+
+def make_planner():
+    """PlannerAgent with only the plan cache state, without providers or sub-agents."""
+    planner = PlannerAgent.__new__(PlannerAgent)
+    planner.answer_callback = None
+    planner.last_answer = ""
+    planner.status_message = ""
+    planner.stop = False
+    planner.logger = Logger("planner_agent.log")
+    planner.plan_adapter = None
+    planner.plan_cache = deque(maxlen=PLAN_CACHE_SIZE)
+    return planner
+
+def run_new_plan(planner, goal, successes):
+    """Run process() on a freshly made PLAN whose tasks succeed as given."""
+    results = iter(successes)
+
+    async def no_cached_plan(goal):
+        return []
+
+    async def make_plan(goal):
+        return PLAN
+
+    async def start_agent_process(task, required_infos):
+        return f"done {task['id']}", next(results)
+
+    async def update_plan(goal, agents_tasks, *args):
+        return agents_tasks
+
+    planner.adapt_cached_plan = no_cached_plan
+    planner.make_plan = make_plan
+    planner.start_agent_process = start_agent_process
+    planner.update_plan = update_plan
+    planner.get_work_result_agent = lambda need, work_result: None
+    return asyncio.run(planner.process(goal, None))
+
+class TestPlannerPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.planner = make_planner()
+
+    def test_extract_keywords_skips_stopwords_and_short_words(self):
+        self.assertEqual(extract_keywords("Please find the best Python web frameworks"),
+                         frozenset({"best", "python", "web", "frameworks"}))
+
+    def test_empty_cache_misses(self):
+        self.assertIsNone(self.planner.find_cached_plan(GOAL))
+
+    def test_similar_goal_hits(self):
+        self.planner.cache_plan(GOAL, PLAN)
+        plan_template = self.planner.find_cached_plan("search the latest python web frameworks then write a summary report")
+        self.assertEqual(json.loads(plan_template)["plan"], [task for _, task in PLAN])
+
+    def test_unrelated_goal_misses(self):
+        self.planner.cache_plan(GOAL, PLAN)
+        self.assertIsNone(self.planner.find_cached_plan("book a flight to tokyo"))
+
+    def test_overlap_below_threshold_misses(self):
+        self.planner.cache_plan(GOAL, PLAN)
+        # 5 shared keywords out of 9 is below PLAN_CACHE_MIN_OVERLAP
+        self.assertIsNone(self.planner.find_cached_plan("search the latest python web frameworks and compare benchmarks"))
+
+    def test_empty_plan_not_cached(self):
+        self.planner.cache_plan(GOAL, [])
+        self.assertEqual(len(self.planner.plan_cache), 0)
+
+    def test_oldest_plan_evicted_when_full(self):
+        for i in range(PLAN_CACHE_SIZE + 1):
+            self.planner.cache_plan(f"topic{i}word", PLAN)
+        self.assertEqual(len(self.planner.plan_cache), PLAN_CACHE_SIZE)
+        self.assertIsNone(self.planner.find_cached_plan("topic0word"))
+        self.assertIsNotNone(self.planner.find_cached_plan(f"topic{PLAN_CACHE_SIZE}word"))
+
+    def test_plan_cached_when_all_tasks_succeed(self):
+        run_new_plan(self.planner, GOAL, [True, True])
+        self.assertIsNotNone(self.planner.find_cached_plan(GOAL))
+
+    def test_plan_not_cached_when_a_task_fails(self):
+        run_new_plan(self.planner, GOAL, [False, True])
+        self.assertIsNone(self.planner.find_cached_plan(GOAL))
+
+if __name__ == '__main__':
+    unittest.main()
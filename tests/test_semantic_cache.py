@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
+from sources.semantic_cache import SemanticCache
+
+VECTORS = {
+    "what is the capital of france": [1.0, 0.0, 0.0],
+    "what's the capital of france?": [0.99, 0.14, 0.0],
+    "write a python script": [0.0, 1.0, 0.0],
+    "find my pdf files": [0.0, 0.0, 1.0],
+}
+
+class FakeSemanticCache(SemanticCache):
+    """SemanticCache with fixed embeddings instead of a downloaded model."""
+    embed_calls = 0
+
+    def embed(self, text):
+        self.embed_calls += 1
+        vector = np.array(VECTORS[text], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = FakeSemanticCache(threshold=0.95, max_entries=2)
+
+    def test_empty_cache_misses(self):
+        self.assertIsNone(self.cache.lookup("write a python script"))
+
+    def test_similar_query_hits(self):
+        response = {"answer": "Paris"}
+        self.cache.add("what is the capital of france", response)
+        self.assertEqual(self.cache.lookup("what's the capital of france?"), response)
+
+    def test_different_query_misses(self):
+        self.cache.add("what is the capital of france", {"answer": "Paris"})
+        self.assertIsNone(self.cache.lookup("write a python script"))
+
+    def test_oldest_entry_evicted_when_full(self):
+        self.cache.add("what is the capital of france", {"answer": "Paris"})
+        self.cache.add("write a python script", {"answer": "print()"})
+        self.cache.add("find my pdf files", {"answer": "a.pdf"})
+        self.assertEqual(self.cache.size, 2)
+        self.assertIsNone(self.cache.lookup("what is the capital of france"))
+        self.assertEqual(self.cache.lookup("find my pdf files"), {"answer": "a.pdf"})
+
+    def test_precomputed_vector_is_reused(self):
+        vector = self.cache.embed("what is the capital of france")
+        self.cache.add("what is the capital of france", {"answer": "Paris"}, vector)
+        self.assertEqual(self.cache.lookup("what is the capital of france", vector), {"answer": "Paris"})
+        self.assertEqual(self.cache.embed_calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()